@@ -0,0 +1,19 @@
+"""
+Celery config for fileUpload project.
+
+Workers are started with ``celery -A fileUpload worker`` and pick up tasks
+from every installed app's ``tasks.py``.
+
+For more information on this file, see
+https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fileUpload.settings')
+
+app = Celery('fileUpload')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -66,6 +66,17 @@ TEMPLATES = [
 WSGI_APPLICATION = 'fileUpload.wsgi.application'
 
 
+# Django REST Framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -121,6 +132,45 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# File uploads
+# https://docs.djangoproject.com/en/5.2/ref/settings/#file-uploads
+
+# Largest file accepted by the upload API, in bytes
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Largest request accepted by the bulk upload API, in bytes
+MAX_BULK_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+
+# Hand uploads to a Celery worker and answer 202 Accepted immediately.
+# The worker must be able to read the web process's temporary directory.
+UPLOAD_ASYNC = os.getenv("UPLOAD_ASYNC", "False").lower() == "true"
+
+# Celery
+# https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_TASK_IGNORE_RESULT = True
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Holds Idempotency-Key replays of upload responses; share it across
+# processes by pointing REDIS_URL at a Redis server
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Cloudinary settings
 
 CLOUDINARY_STORAGE = {
@@ -0,0 +1,9 @@
+// Select the whole Cloudinary URL on click so it can be copied
+document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('.cloudinary-url').forEach(function (input) {
+        input.title = 'Click to select and copy';
+        input.addEventListener('click', function () {
+            input.select();
+        });
+    });
+});
@@ -1,11 +1,56 @@
 # admin.py
+from functools import lru_cache
+
 from django.contrib import admin
-from django.utils.html import format_html
+from django.contrib.admin.views.main import ChangeList
+from django.utils.html import escape
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import UploadedFile
 
 
+# (format, attribute) per size unit, indexed by (bit_length - 1) // 10
+_SIZE_BUCKETS = (
+    ('{} bytes', 'file_size'),
+    ('{:.1f} KB', '_size_kb'),
+    ('{:.2f} MB', '_size_mb'),
+)
+
+
+# The HTML fragments below depend only on a URL, so repeated changelist
+# renders of the same rows are served from these caches.
+
+@lru_cache(maxsize=2048)
+def _preview_link_html(url):
+    return mark_safe(f'<a href="{escape(url)}" target="_blank" class="button">Preview</a>')
+
+
+@lru_cache(maxsize=2048)
+def _download_link_html(url):
+    return mark_safe(f'<a href="{escape(url)}" target="_blank" class="button">Download</a>')
+
+
+@lru_cache(maxsize=2048)
+def _thumbnail_html(url):
+    return mark_safe(
+        f'<img src="{escape(url)}" '
+        'style="max-width: 200px; max-height: 200px; border: 1px solid #ddd;" />'
+    )
+
+
+@lru_cache(maxsize=2048)
+def _cloudinary_preview_html(url):
+    # Click-to-select behaviour lives in custom_file_admin.js
+    return mark_safe(f'<input type="text" class="cloudinary-url" value="{escape(url)}" readonly>')
+
+
+class UploadedFileChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # Only select the columns the changelist actually renders
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.only(*self.model_admin._list_only_fields)
+
+
 @admin.register(UploadedFile)
 class UploadedFileAdmin(admin.ModelAdmin):
     list_display = [
@@ -13,6 +58,7 @@ class UploadedFileAdmin(admin.ModelAdmin):
         'original_name',
         'file_size_display',
         'content_type',
+        'status',
         'preview_link',
         'download_link',
         'created_at',
@@ -21,6 +67,7 @@ class UploadedFileAdmin(admin.ModelAdmin):
     
     list_filter = [
         'content_type',
+        'status',
         'created_at',
         'updated_at'
     ]
@@ -44,12 +91,14 @@ class UploadedFileAdmin(admin.ModelAdmin):
         'id',
         'original_name',
         'cloudinary_url',
+        'attachment_url',
         'cloudinary_preview',
         'preview_image',
         'file_size',
         'file_size_display',
         'file_size_mb_display',
         'content_type',
+        'status',
         'created_at',
         'updated_at'
     ]
@@ -58,84 +107,72 @@ class UploadedFileAdmin(admin.ModelAdmin):
     
     list_per_page = 25
     
+    # UploadedFile has no relations, so there is nothing to join
+    list_select_related = False
+    
+    # Columns read by list_display; the change form loads and saves the
+    # full row
+    _list_only_fields = (
+        'id',
+        'original_name',
+        'file_size',
+        'content_type',
+        'status',
+        'cloudinary_url',
+        'attachment_url',
+        'created_at',
+        'updated_at',
+    )
+    
     def file_size_display(self, obj):
         """Display file size in human readable format"""
         if obj.file_size:
-            if obj.file_size < 1024:
-                return f"{obj.file_size} bytes"
-            elif obj.file_size < 1024 * 1024:
-                return f"{obj.file_size / 1024:.1f} KB"
-            else:
-                return f"{obj.file_size / (1024 * 1024):.2f} MB"
+            fmt, attr = _SIZE_BUCKETS[min((obj.file_size.bit_length() - 1) // 10, 2)]
+            return fmt.format(getattr(obj, attr))
         return "Unknown"
     file_size_display.short_description = "File Size"
     
     def file_size_mb_display(self, obj):
         """Display file size in MB"""
         if obj.file_size:
-            return f"{obj.file_size / (1024 * 1024):.2f} MB"
+            return f"{obj._size_mb:.2f} MB"
         return "Unknown"
     file_size_mb_display.short_description = "Size (MB)"
     
     def preview_link(self, obj):
         """Create a preview link for the file"""
         if obj.cloudinary_url:
-            return format_html(
-                '<a href="{}" target="_blank" class="button">Preview</a>',
-                obj.cloudinary_url
-            )
+            return _preview_link_html(obj.cloudinary_url)
         return "No URL"
     preview_link.short_description = "Preview"
     
     def download_link(self, obj):
         """Create a download link for the file"""
-        if obj.cloudinary_url:
-            # For Cloudinary URLs, you can add fl_attachment to force download
-            download_url = obj.cloudinary_url.replace('/upload/', '/upload/fl_attachment/')
-            return format_html(
-                '<a href="{}" target="_blank" class="button">Download</a>',
-                download_url
-            )
+        if obj.attachment_url:
+            return _download_link_html(obj.attachment_url)
         return "No URL"
     download_link.short_description = "Download"
     
     def preview_image(self, obj):
         """Show image preview if the file is an image"""
         if obj.cloudinary_url and obj.content_type and obj.content_type.startswith('image/'):
-            # Create a thumbnail version using Cloudinary transformations
-            thumbnail_url = obj.cloudinary_url.replace(
-                '/upload/', 
-                '/upload/w_200,h_200,c_fit,q_auto/'
-            )
-            return format_html(
-                '<img src="{}" style="max-width: 200px; max-height: 200px; border: 1px solid #ddd;" />',
-                thumbnail_url
-            )
+            return _thumbnail_html(obj.thumbnail_url(200, 200))
         return "Not an image"
     preview_image.short_description = "Image Preview"
     
     def cloudinary_preview(self, obj):
         """Show Cloudinary URL with copy button"""
         if obj.cloudinary_url:
-            return format_html(
-                '''
-                <div style="max-width: 400px;">
-                    <input type="text" value="{}" readonly 
-                           style="width: 100%; margin-bottom: 5px;" 
-                           onclick="this.select();" />
-                    <br>
-                    <small>Click to select and copy</small>
-                </div>
-                ''',
-                obj.cloudinary_url
-            )
+            return _cloudinary_preview_html(obj.cloudinary_url)
         return "No URL"
     cloudinary_preview.short_description = "Cloudinary URL"
     
     def get_queryset(self, request):
-        """Optimize queryset to avoid N+1 queries"""
-        queryset = super().get_queryset(request)
-        return queryset.select_related()
+        """Annotate the sizes the size columns display"""
+        return super().get_queryset(request).with_size_units()
+    
+    def get_changelist(self, request, **kwargs):
+        return UploadedFileChangeList
     
     def has_add_permission(self, request):
         """Disable adding files through admin (use API instead)"""
@@ -159,8 +196,6 @@ class UploadedFileAdmin(admin.ModelAdmin):
 # Optional: Custom admin action to bulk delete files
 def bulk_delete_files(modeladmin, request, queryset):
     """Custom admin action to bulk delete files"""
-    count = queryset.count()
-    
     # Optional: Add Cloudinary cleanup here
     # for file_obj in queryset:
     #     try:
@@ -168,7 +203,8 @@ def bulk_delete_files(modeladmin, request, queryset):
     #     except Exception as e:
     #         messages.warning(request, f"Failed to delete {file_obj.original_name} from Cloudinary: {e}")
     
-    queryset.delete()
+    # delete() reports how many rows it removed, so no separate COUNT query
+    count, _ = queryset.delete()
     
     modeladmin.message_user(
         request,
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['content_type', '-created_at'], name='upl_ctype_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['-created_at'], name='upl_created_idx'),
+        ),
+    ]
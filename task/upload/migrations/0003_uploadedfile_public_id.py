@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0002_uploadedfile_upl_ctype_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='public_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
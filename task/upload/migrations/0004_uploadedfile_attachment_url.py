@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0003_uploadedfile_public_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='attachment_url',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:30
+
+from django.db import migrations
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Left, StrIndex, Substr
+
+_UPLOAD = '/upload/'
+
+
+def backfill_attachment_url(apps, schema_editor):
+    UploadedFile = apps.get_model('upload', 'UploadedFile')
+    # Rewrite only the first /upload/ segment, like build_attachment_url;
+    # a public_id inside an "upload" folder must stay untouched
+    position = StrIndex('cloudinary_url', Value(_UPLOAD))
+    UploadedFile.objects.filter(attachment_url='', cloudinary_url__contains=_UPLOAD).update(
+        attachment_url=Concat(
+            Left('cloudinary_url', position - 1),
+            Value('/upload/fl_attachment/'),
+            Substr('cloudinary_url', position + len(_UPLOAD)),
+        )
+    )
+    # Nothing to rewrite; build_attachment_url falls back to the URL as is
+    UploadedFile.objects.filter(attachment_url='').update(attachment_url=F('cloudinary_url'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0004_uploadedfile_attachment_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_attachment_url, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0005_backfill_attachment_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['updated_at'], name='upl_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0006_uploadedfile_upl_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='uploadedfile',
+            name='cloudinary_url',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+    ]
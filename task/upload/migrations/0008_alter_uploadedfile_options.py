@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 17:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('upload', '0007_uploadedfile_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='uploadedfile',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Uploaded File', 'verbose_name_plural': 'Uploaded Files'},
+        ),
+    ]
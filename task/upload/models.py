@@ -1,27 +1,92 @@
 # models.py
+import cloudinary
 from django.db import models
+from django.db.models import ExpressionWrapper, F, FloatField
 from django.utils import timezone
 
 
+_KB = 1024
+_MB = 1024 * 1024
+# Float divisors so the database does not truncate with integer division
+_KB_F = float(_KB)
+_MB_F = float(_MB)
+
+
+class UploadedFileQuerySet(models.QuerySet):
+    def with_size_units(self):
+        """Annotate file size in KB and MB so rows don't divide in Python"""
+        return self.annotate(
+            _size_kb=ExpressionWrapper(F('file_size') / _KB_F, output_field=FloatField()),
+            _size_mb=ExpressionWrapper(F('file_size') / _MB_F, output_field=FloatField()),
+        )
+
+
 class UploadedFile(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+    
     original_name = models.CharField(max_length=255)
-    cloudinary_url = models.URLField(max_length=500)
+    # Blank while a background upload is still pending
+    cloudinary_url = models.URLField(max_length=500, blank=True)
+    public_id = models.CharField(max_length=255, blank=True, default='')
+    attachment_url = models.URLField(max_length=500, blank=True)
     file_size = models.PositiveIntegerField(null=True, blank=True)  # in bytes
     content_type = models.CharField(max_length=100, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.READY)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UploadedFileQuerySet.as_manager()
+    
     class Meta:
-        ordering = ['-created_at']
+        # id breaks ties between rows created in the same instant, which
+        # keeps pagination stable
+        ordering = ['-created_at', '-id']
         verbose_name = 'Uploaded File'
         verbose_name_plural = 'Uploaded Files'
+        indexes = [
+            models.Index(fields=['content_type', '-created_at'], name='upl_ctype_created_idx'),
+            models.Index(fields=['-created_at'], name='upl_created_idx'),
+            models.Index(fields=['updated_at'], name='upl_updated_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.original_name} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+        # 'YYYY-MM-DD HH:MM'; isoformat is cheaper than strftime
+        return f"{self.original_name} - {self.created_at.isoformat(sep=' ', timespec='minutes')[:16]}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # with_size_units() values describe the row as it was loaded; drop
+        # them so file_size_mb follows the file_size that was just saved
+        for attr in ('_size_kb', '_size_mb'):
+            self.__dict__.pop(attr, None)
     
     @property
     def file_size_mb(self):
         """Return file size in MB"""
         if self.file_size:
-            return round(self.file_size / (1024 * 1024), 2)
-        return None
\ No newline at end of file
+            size_mb = getattr(self, '_size_mb', None)
+            if size_mb is None:
+                size_mb = self.file_size / _MB
+            return round(size_mb, 2)
+        return None
+    
+    def thumbnail_url(self, width, height):
+        """Cloudinary URL for a thumbnail, letting the CDN pick the image format"""
+        if self.public_id:
+            return cloudinary.CloudinaryImage(self.public_id).build_url(
+                width=width,
+                height=height,
+                crop='fit',
+                quality='auto',
+                fetch_format='auto',
+                secure=True,
+            )
+        if self.cloudinary_url:
+            # Rows uploaded before public_id was stored
+            return self.cloudinary_url.replace(
+                '/upload/', f'/upload/w_{width},h_{height},c_fit,q_auto,f_auto/', 1
+            )
+        return ''
\ No newline at end of file
@@ -0,0 +1,20 @@
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class UploadedFilePagination(PageNumberPagination):
+    """
+    Page number pagination wrapped in the API's standard response envelope
+    """
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'success': True,
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'data': data
+        })
@@ -1,7 +1,39 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import UploadedFile
 
 
+_ALLOWED_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png', 'image/gif',
+    'application/pdf', 'text/plain', 'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/json', 'text/csv',
+})
+
+_ALLOWED_TYPES_STR = ', '.join(sorted(_ALLOWED_TYPES))
+
+
+def _validate_upload(value):
+    """
+    Check an uploaded file against the size limit and allowed types
+    """
+    # File size validation runs first so oversized files fail fast
+    max_size = settings.MAX_UPLOAD_SIZE
+    if value.size > max_size:
+        raise serializers.ValidationError(
+            f"File size cannot exceed {max_size // (1024 * 1024)}MB"
+        )
+    
+    # File type validation
+    if value.content_type not in _ALLOWED_TYPES:
+        raise serializers.ValidationError(
+            f"File type '{value.content_type}' is not supported. "
+            f"Allowed types: {_ALLOWED_TYPES_STR}"
+        )
+    
+    return value
+
+
 class FileUploadSerializer(serializers.Serializer):
     """
     Serializer for handling file uploads
@@ -16,34 +48,32 @@ class FileUploadSerializer(serializers.Serializer):
         """
         Validate the uploaded file
         """
-        # File size validation (10MB limit)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if value.size > max_size:
-            raise serializers.ValidationError("File size cannot exceed 10MB")
-        
-        # File type validation
-        allowed_types = [
-            'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 
-            'application/pdf', 'text/plain', 'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'application/json',
-            'application/json', 'text/csv'
-        ]
-        
-        if value.content_type not in allowed_types:
-            raise serializers.ValidationError(
-                f"File type '{value.content_type}' is not supported. "
-                f"Allowed types: {', '.join(allowed_types)}"
-            )
-        
-        return value
+        return _validate_upload(value)
+
+
+class BulkFileUploadSerializer(serializers.Serializer):
+    """
+    Serializer for handling several file uploads in one request
+    """
+    files = serializers.ListField(
+        child=serializers.FileField(),
+        allow_empty=False,
+        help_text="Select the files to upload"
+    )
+    
+    def validate_files(self, value):
+        """
+        Validate each uploaded file
+        """
+        return [_validate_upload(file) for file in value]
 
 
 class UploadedFileSerializer(serializers.ModelSerializer):
     """
     Serializer for displaying uploaded file information
     """
-    file_size_mb = serializers.SerializerMethodField()
+    # Reads UploadedFile.file_size_mb, which uses the SQL-annotated _size_mb
+    file_size_mb = serializers.FloatField(read_only=True)
     upload_date = serializers.DateTimeField(source='created_at', read_only=True)
     
     class Meta:
@@ -55,17 +85,10 @@ class UploadedFileSerializer(serializers.ModelSerializer):
             'file_size',
             'file_size_mb',
             'content_type',
+            'status',
             'upload_date'
         ]
-        read_only_fields = ['id', 'cloudinary_url', 'upload_date']
-    
-    def get_file_size_mb(self, obj):
-        """
-        Convert file size to MB for better readability
-        """
-        if obj.file_size:
-            return round(obj.file_size / (1024 * 1024), 2)
-        return None
+        read_only_fields = ['id', 'cloudinary_url', 'status', 'upload_date']
 
 
 class FileUploadResponseSerializer(serializers.Serializer):
@@ -0,0 +1,52 @@
+# upload/tasks.py
+import logging
+import os
+
+from celery import shared_task
+from django.utils import timezone
+
+from .models import UploadedFile
+from .utils import build_attachment_url, upload_to_cloudinary
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def push_to_cloudinary(pk, temp_path):
+    """
+    Uploads a file that was spooled to disk by the upload view and records
+    the Cloudinary result on its pending UploadedFile row.
+
+    Parameters
+    ----------
+    pk : int
+        Primary key of the pending UploadedFile.
+    temp_path : str
+        Path of the temporary file; it is removed once the upload finishes.
+    """
+    try:
+        result = upload_to_cloudinary(temp_path)
+    finally:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            # Never visible to this worker, or a redelivered task already
+            # removed it; upload_to_cloudinary reported the error
+            pass
+
+    # Only a pending row is ours to complete; a redelivered task must not
+    # overwrite the outcome of the first run.
+    # update() skips auto_now, so set updated_at for the list ETag
+    rows = UploadedFile.objects.filter(pk=pk, status=UploadedFile.Status.PENDING)
+    if result.get("error") or "secure_url" not in result:
+        logger.error("Background upload error for file %s: %s", pk, result.get('error'))
+        rows.update(status=UploadedFile.Status.FAILED, updated_at=timezone.now())
+        return
+
+    rows.update(
+        cloudinary_url=result["secure_url"],
+        public_id=result.get("public_id", ""),
+        attachment_url=build_attachment_url(result),
+        status=UploadedFile.Status.READY,
+        updated_at=timezone.now(),
+    )
@@ -1,5 +1,8 @@
 import pytest
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.move import file_move_safe
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
@@ -8,8 +11,12 @@ from unittest.mock import patch, Mock, MagicMock
 from io import BytesIO
 from PIL import Image
 import json
+import os
+import tempfile
 
 from .models import UploadedFile
+from .tasks import push_to_cloudinary
+from .utils import LARGE_FILE_THRESHOLD, UPLOAD_CHUNK_SIZE, upload_to_cloudinary
 from .views import UploadFileViewSet
 
 
@@ -29,41 +36,72 @@ def get_upload_urls():
     return list_url, detail_url
 
 
+def _make_jpeg_bytes():
+    """Encode a small test JPEG"""
+    image = Image.new('RGB', (100, 100), color='red')
+    image_io = BytesIO()
+    image.save(image_io, format='JPEG')
+    return image_io.getvalue()
+
+
+# Encoded once per test run and wrapped in a fresh upload by each test
+_JPEG_BYTES = _make_jpeg_bytes()
+
+
 class UploadFileViewSetTest(APITestCase):
     """Test cases for UploadFileViewSet"""
     
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Patch once for the whole class; setUp resets the mock per test.
+        # The SDK-level patches catch any path that misses the view patch.
+        cls._patchers = [
+            patch('upload.views.upload_to_cloudinary'),
+            patch('cloudinary.uploader.upload'),
+            patch('cloudinary.uploader.upload_large'),
+        ]
+        cls.mock_upload = cls._patchers[0].start()
+        for patcher in cls._patchers[1:]:
+            patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        for patcher in cls._patchers:
+            patcher.stop()
+        super().tearDownClass()
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create a sample uploaded file record shared by every test"""
+        cls.uploaded_file = UploadedFile.objects.create(
+            original_name="sample.txt",
+            cloudinary_url="https://res.cloudinary.com/test/sample.jpg",
+            file_size=1024,
+            content_type="text/plain"
+        )
+    
     def setUp(self):
         """Set up test fixtures"""
-        self.client = APIClient()
         self.upload_url, self.detail_url_func = get_upload_urls()
         
+        self.mock_upload.reset_mock(return_value=True, side_effect=True)
+        self.mock_upload.return_value = {
+            "secure_url": "https://res.cloudinary.com/test/uploaded_file.jpg",
+            "public_id": "test_public_id"
+        }
+        
         # Create test files
-        self.test_image = self.create_test_image()
+        self.test_image = SimpleUploadedFile(
+            "test_image.jpg",
+            _JPEG_BYTES,
+            content_type="image/jpeg"
+        )
         self.test_text_file = SimpleUploadedFile(
             "test.txt",
             b"Test file content",
             content_type="text/plain"
         )
-        
-        # Create a sample uploaded file record for testing
-        self.uploaded_file = UploadedFile.objects.create(
-            original_name="sample.txt",
-            cloudinary_url="https://res.cloudinary.com/test/sample.jpg",
-            file_size=1024,
-            content_type="text/plain"
-        )
-    
-    def create_test_image(self):
-        """Create a test image file"""
-        image = Image.new('RGB', (100, 100), color='red')
-        image_io = BytesIO()
-        image.save(image_io, format='JPEG')
-        image_io.seek(0)
-        return SimpleUploadedFile(
-            "test_image.jpg",
-            image_io.read(),
-            content_type="image/jpeg"
-        )
     
     def test_get_serializer_class_create_action(self):
         """Test that create action uses FileUploadSerializer"""
@@ -81,15 +119,9 @@ class UploadFileViewSetTest(APITestCase):
         from .serializers import UploadedFileSerializer
         self.assertEqual(viewset.get_serializer_class(), UploadedFileSerializer)
     
-    @patch('upload.views.upload_to_cloudinary')  # Replace with your actual app name
-    def test_create_successful_upload(self, mock_upload):
+    def test_create_successful_upload(self):
         """Test successful file upload"""
-        # Mock Cloudinary response
-        mock_upload.return_value = {
-            "secure_url": "https://res.cloudinary.com/test/uploaded_file.jpg",
-            "public_id": "test_public_id"
-        }
-        
+        # Uses the default Cloudinary response set up in setUp
         response = self.client.post(
             self.upload_url,
             {'file': self.test_image},
@@ -106,6 +138,248 @@ class UploadFileViewSetTest(APITestCase):
         new_file = UploadedFile.objects.latest('id')
         self.assertEqual(new_file.original_name, 'test_image.jpg')
         self.assertEqual(new_file.cloudinary_url, 'https://res.cloudinary.com/test/uploaded_file.jpg')
+        self.assertEqual(new_file.public_id, 'test_public_id')
+        self.assertIn('/upload/fl_attachment/', new_file.attachment_url)
+        
+        # The inline response body matches what the serializer would produce
+        from .serializers import UploadedFileSerializer
+        self.assertEqual(response.data['data'], UploadedFileSerializer(new_file).data)
+        
+        # The upload was spooled to disk and handed over by path
+        self.assertIsInstance(self.mock_upload.call_args.args[0], str)
+    
+    def test_create_replays_idempotency_key(self):
+        """Test that a retried upload with the same Idempotency-Key is not re-uploaded"""
+        cache.clear()
+        first = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-1'
+        )
+        self.test_image.seek(0)
+        second = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-1'
+        )
+        
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.mock_upload.assert_called_once()
+        self.assertEqual(UploadedFile.objects.count(), 2)  # 1 from setUp + 1 new
+    
+    @override_settings(UPLOAD_ASYNC=True)
+    @patch('upload.views.push_to_cloudinary')
+    def test_create_async_replays_idempotency_key(self, mock_task):
+        """Test that a retried async upload is not queued twice"""
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.post(
+                self.upload_url,
+                {'file': self.test_image},
+                format='multipart',
+                HTTP_IDEMPOTENCY_KEY='retry-async'
+            )
+        self.test_image.seek(0)
+        second = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-async'
+        )
+        
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data, first.data)
+        mock_task.delay.assert_called_once()
+        os.unlink(mock_task.delay.call_args.args[1])
+    
+    def test_create_idempotency_key_in_progress(self):
+        """Test that a key still reserved by another request is answered with 409"""
+        cache.clear()
+        cache.add('upl:retry-busy', 'reserved')
+        
+        response = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-busy'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(response.data['success'])
+        self.mock_upload.assert_not_called()
+    
+    def test_create_failure_releases_idempotency_key(self):
+        """Test that a failed upload can be retried with the same key"""
+        cache.clear()
+        self.mock_upload.return_value = {"error": "Upload failed"}
+        response = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-failed'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.mock_upload.return_value = {
+            "secure_url": "https://res.cloudinary.com/test/uploaded_file.jpg",
+            "public_id": "test_public_id"
+        }
+        self.test_image.seek(0)
+        response = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-failed'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.mock_upload.call_count, 2)
+    
+    @override_settings(UPLOAD_ASYNC=True)
+    @patch('upload.views.push_to_cloudinary')
+    def test_create_async_upload(self, mock_task):
+        """Test that async uploads are queued and answered with 202"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.upload_url,
+                {'file': self.test_image},
+                format='multipart'
+            )
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(response.data['success'])
+        self.assertEqual(response.data['data']['status'], UploadedFile.Status.PENDING)
+        
+        pk, temp_path = mock_task.delay.call_args.args
+        self.assertEqual(pk, response.data['data']['id'])
+        self.assertTrue(os.path.exists(temp_path))
+        os.unlink(temp_path)
+    
+    @override_settings(UPLOAD_ASYNC=True)
+    @patch('upload.views.push_to_cloudinary')
+    def test_create_async_enqueue_failure(self, mock_task):
+        """Test that a failed enqueue leaves no pending row or temporary file behind"""
+        mock_task.delay.side_effect = ConnectionError("Broker unreachable")
+        
+        with self.assertRaises(ConnectionError):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    self.upload_url,
+                    {'file': self.test_image},
+                    format='multipart'
+                )
+        
+        pk, temp_path = mock_task.delay.call_args.args
+        self.assertFalse(UploadedFile.objects.filter(pk=pk).exists())
+        self.assertFalse(os.path.exists(temp_path))
+    
+    @patch('upload.tasks.upload_to_cloudinary')
+    def test_push_to_cloudinary_task(self, mock_upload):
+        """Test that the background task completes a pending upload"""
+        mock_upload.return_value = {
+            "secure_url": "https://res.cloudinary.com/test/uploaded_file.jpg",
+            "public_id": "test_public_id"
+        }
+        pending = UploadedFile.objects.create(
+            original_name="pending.txt",
+            file_size=1024,
+            content_type="text/plain",
+            status=UploadedFile.Status.PENDING
+        )
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(b"pending content")
+        
+        push_to_cloudinary(pending.pk, tmp.name)
+        
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, UploadedFile.Status.READY)
+        self.assertEqual(pending.cloudinary_url, 'https://res.cloudinary.com/test/uploaded_file.jpg')
+        self.assertFalse(os.path.exists(tmp.name))
+        
+        # A redelivered task finds the file gone but leaves the result alone
+        mock_upload.return_value = {"error": "No such file or directory"}
+        push_to_cloudinary(pending.pk, tmp.name)
+        
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, UploadedFile.Status.READY)
+    
+    @patch('upload.tasks.upload_to_cloudinary')
+    def test_push_to_cloudinary_task_missing_file(self, mock_upload):
+        """Test that a temporary file the worker cannot see fails the upload"""
+        mock_upload.return_value = {"error": "No such file or directory"}
+        pending = UploadedFile.objects.create(
+            original_name="pending.txt",
+            file_size=1024,
+            content_type="text/plain",
+            status=UploadedFile.Status.PENDING
+        )
+        
+        push_to_cloudinary(pending.pk, os.path.join(tempfile.gettempdir(), "missing-upload.txt"))
+        
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, UploadedFile.Status.FAILED)
+    
+    @override_settings(UPLOAD_ASYNC=True)
+    @patch('upload.views.file_move_safe', wraps=file_move_safe)
+    @patch('upload.models.UploadedFile.objects.create')
+    def test_create_async_database_error(self, mock_create, mock_move):
+        """Test that a failed insert removes the moved temporary file"""
+        mock_create.side_effect = Exception("Database error")
+        
+        response = self.client.post(
+            self.upload_url,
+            {'file': self.test_image},
+            format='multipart'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        temp_path = mock_move.call_args.args[1]
+        self.assertFalse(os.path.exists(temp_path))
+    
+    def test_bulk_upload(self):
+        """Test uploading several files in one request"""
+        def fake_upload(path):
+            # Uploads run on worker threads, so answer by content, not call order
+            with open(path, 'rb') as f:
+                if f.read() == b"second":
+                    return {"error": "Upload failed"}
+            return {"secure_url": "https://res.cloudinary.com/test/first.txt", "public_id": "first"}
+        self.mock_upload.side_effect = fake_upload
+        files = [
+            SimpleUploadedFile("first.txt", b"first", content_type="text/plain"),
+            SimpleUploadedFile("second.txt", b"second", content_type="text/plain"),
+            SimpleUploadedFile("second.txt", b"second", content_type="text/plain"),
+        ]
+        
+        response = self.client.post(
+            reverse('uploadedfile-bulk'),
+            {'files': files},
+            format='multipart'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertEqual(response.data['data'][0]['original_name'], 'first.txt')
+        # Both failures are reported even though the files share a name
+        self.assertEqual(response.data['errors']['cloudinary'], [
+            {'name': 'second.txt', 'error': 'Upload failed'},
+            {'name': 'second.txt', 'error': 'Upload failed'},
+        ])
+        self.assertTrue(UploadedFile.objects.filter(original_name='first.txt').exists())
+    
+    def test_bulk_rejects_oversized_request(self):
+        """Test that an oversized bulk upload is rejected from its Content-Length"""
+        response = self.client.post(
+            reverse('uploadedfile-bulk'),
+            {'files': [self.test_text_file]},
+            format='multipart',
+            CONTENT_LENGTH=str(settings.MAX_BULK_UPLOAD_SIZE * 2)
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.mock_upload.assert_not_called()
     
     def test_create_invalid_serializer(self):
         """Test upload with invalid data"""
@@ -120,10 +394,67 @@ class UploadFileViewSetTest(APITestCase):
         self.assertEqual(response.data['message'], 'Validation failed')
         self.assertIn('errors', response.data)
     
-    @patch('upload.views.upload_to_cloudinary')  # Replace with your actual app name
-    def test_create_cloudinary_error(self, mock_upload):
+    def test_create_rejects_oversized_request(self):
+        """Test that an oversized upload is rejected from its Content-Length"""
+        response = self.client.post(
+            self.upload_url,
+            {'file': self.test_text_file},
+            format='multipart',
+            CONTENT_LENGTH=str(settings.MAX_UPLOAD_SIZE * 2)
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.mock_upload.assert_not_called()
+    
+    @patch('django.http.request.HttpRequest._load_post_and_files')
+    def test_create_rejects_oversized_request_before_csrf(self, mock_load):
+        """Test that a logged-in user's oversized upload is rejected before the body is parsed"""
+        from django.contrib.auth.models import User
+        client = APIClient(enforce_csrf_checks=True)
+        client.force_login(User.objects.create_user('uploader', password='secret'))
+        
+        response = client.post(
+            self.upload_url,
+            {'file': self.test_text_file},
+            format='multipart',
+            CONTENT_LENGTH=str(settings.MAX_UPLOAD_SIZE * 2)
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        mock_load.assert_not_called()
+    
+    def test_create_rejects_non_multipart_request(self):
+        """Test that uploads must be sent as multipart/form-data"""
+        response = self.client.post(self.upload_url, {'file': 'x'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    
+    def test_create_negotiates_before_preflight(self):
+        """Test that pre-flight rejections run after content negotiation"""
+        response = self.client.post(
+            self.upload_url,
+            {'file': 'x'},
+            format='json',
+            HTTP_ACCEPT='application/xml'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+    
+    def test_upload_large_file(self):
+        """Test that files over the size limit are rejected"""
+        # Validation only looks at .size, so skip allocating the real bytes
+        file_data = SimpleUploadedFile("large.txt", b"x", content_type="text/plain")
+        file_data.size = settings.MAX_UPLOAD_SIZE + 1
+        
+        from .serializers import FileUploadSerializer
+        serializer = FileUploadSerializer(data={'file': file_data})
+        
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('file', serializer.errors)
+    
+    def test_create_cloudinary_error(self):
         """Test Cloudinary upload error"""
-        mock_upload.return_value = {
+        self.mock_upload.return_value = {
             "error": "Upload failed"
         }
         
@@ -139,10 +470,9 @@ class UploadFileViewSetTest(APITestCase):
         self.assertIn('errors', response.data)
         self.assertIn('cloudinary', response.data['errors'])
     
-    @patch('upload.views.upload_to_cloudinary')  # Replace with your actual app name
-    def test_create_no_secure_url(self, mock_upload):
+    def test_create_no_secure_url(self):
         """Test Cloudinary response without secure_url"""
-        mock_upload.return_value = {
+        self.mock_upload.return_value = {
             "public_id": "test_id"
             # No secure_url
         }
@@ -159,11 +489,10 @@ class UploadFileViewSetTest(APITestCase):
         self.assertIn('errors', response.data)
         self.assertEqual(response.data['errors']['cloudinary'], 'No secure URL returned')
     
-    @patch('upload.views.upload_to_cloudinary')  # Replace with your actual app name
-    @patch('upload.models.UploadedFile.objects.create')  # Replace with your actual app name
-    def test_create_database_error(self, mock_create, mock_upload):
+    @patch('upload.models.UploadedFile.objects.bulk_create')  # Replace with your actual app name
+    def test_create_database_error(self, mock_create):
         """Test database error during file creation"""
-        mock_upload.return_value = {
+        self.mock_upload.return_value = {
             "secure_url": "https://res.cloudinary.com/test/uploaded_file.jpg"
         }
         mock_create.side_effect = Exception("Database error")
@@ -198,6 +527,23 @@ class UploadFileViewSetTest(APITestCase):
         self.assertIn('data', response.data)
         self.assertEqual(len(response.data['data']), 2)
     
+    def test_list_files_paginated(self):
+        """Test that the list is paginated with the total count"""
+        UploadedFile.objects.create(
+            original_name="test2.txt",
+            cloudinary_url="https://res.cloudinary.com/test/test2.jpg",
+            file_size=2048,
+            content_type="text/plain"
+        )
+        
+        response = self.client.get(self.upload_url, {'page_size': 1})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertEqual(response.data['data'][0]['original_name'], 'test2.txt')
+        self.assertIsNotNone(response.data['next'])
+    
     def test_list_empty_files(self):
         """Test listing when no files exist"""
         UploadedFile.objects.all().delete()
@@ -209,6 +555,61 @@ class UploadFileViewSetTest(APITestCase):
         self.assertEqual(response.data['count'], 0)
         self.assertEqual(len(response.data['data']), 0)
     
+    def test_list_file_size_mb(self):
+        """Test that file_size_mb is computed from the annotated queryset"""
+        UploadedFile.objects.create(
+            original_name="large.pdf",
+            cloudinary_url="https://res.cloudinary.com/test/large.pdf",
+            file_size=5 * 1024 * 1024 + 512 * 1024,
+            content_type="application/pdf"
+        )
+        
+        response = self.client.get(self.upload_url)
+        
+        sizes = {item['original_name']: item['file_size_mb'] for item in response.data['data']}
+        self.assertEqual(sizes['large.pdf'], 5.5)
+        self.assertEqual(sizes['sample.txt'], 0.0)
+    
+    def test_update_file_size_mb(self):
+        """Test that file_size_mb follows a file_size changed by an update"""
+        response = self.client.patch(
+            self.detail_url_func(self.uploaded_file.id),
+            {'file_size': 3 * 1024 * 1024},
+            format='multipart'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['file_size_mb'], 3.0)
+    
+    def test_list_not_modified(self):
+        """Test that an unchanged file list answers conditional GETs with 304"""
+        response = self.client.get(self.upload_url)
+        etag = response['ETag']
+        
+        response = self.client.get(self.upload_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.uploaded_file.delete()
+        response = self.client.get(self.upload_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_list_modified_after_update(self):
+        """Test that editing a file through the API invalidates the list ETag"""
+        response = self.client.get(self.upload_url)
+        etag = response['ETag']
+        
+        response = self.client.patch(
+            self.detail_url_func(self.uploaded_file.id),
+            {'original_name': 'renamed.txt'},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.get(self.upload_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'][0]['original_name'], 'renamed.txt')
+    
     def test_retrieve_file(self):
         """Test retrieving a specific file"""
         response = self.client.get(self.detail_url_func(self.uploaded_file.id))
@@ -239,10 +640,9 @@ class UploadFileViewSetTest(APITestCase):
         self.assertEqual(list(viewset.queryset), list(UploadedFile.objects.all()))
     
     @patch('upload.views.logger')  # Replace with your actual app name
-    @patch('upload.views.upload_to_cloudinary')  # Replace with your actual app name
-    def test_logging_on_error(self, mock_upload, mock_logger):
+    def test_logging_on_error(self, mock_logger):
         """Test that errors are logged properly"""
-        mock_upload.side_effect = Exception("Test error")
+        self.mock_upload.side_effect = Exception("Test error")
         
         response = self.client.post(
             self.upload_url,
@@ -251,7 +651,9 @@ class UploadFileViewSetTest(APITestCase):
         )
         
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
-        mock_logger.error.assert_called_once_with("Upload error: Test error")
+        mock_logger.error.assert_called_once()
+        message, error = mock_logger.error.call_args.args
+        self.assertEqual(message % error, "Upload error: Test error")
 
 
 class UploadFileViewSetIntegrationTest(APITestCase):
@@ -259,7 +661,6 @@ class UploadFileViewSetIntegrationTest(APITestCase):
     
     def setUp(self):
         """Set up test fixtures"""
-        self.client = APIClient()
         self.upload_url, self.detail_url_func = get_upload_urls()
     
     def create_test_file(self, name="test.txt", content=b"test content", content_type="text/plain"):
@@ -396,6 +797,35 @@ class UploadFileViewSetIntegrationTest(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
 
+class UploadToCloudinaryTest(SimpleTestCase):
+    """Test cases for the upload_to_cloudinary helper"""
+    
+    @patch('cloudinary.uploader.upload_large')
+    @patch('cloudinary.uploader.upload')
+    def test_small_file_uses_single_request(self, mock_upload, mock_upload_large):
+        """Test that small files are sent in one request"""
+        small_file = SimpleUploadedFile("small.txt", b"small", content_type="text/plain")
+        
+        upload_to_cloudinary(small_file)
+        
+        mock_upload.assert_called_once_with(small_file, resource_type="auto")
+        mock_upload_large.assert_not_called()
+    
+    @patch('cloudinary.uploader.upload_large')
+    @patch('cloudinary.uploader.upload')
+    def test_large_file_is_chunked(self, mock_upload, mock_upload_large):
+        """Test that large files are streamed with upload_large"""
+        large_file = SimpleUploadedFile("large.txt", b"x", content_type="text/plain")
+        large_file.size = LARGE_FILE_THRESHOLD + 1
+        
+        upload_to_cloudinary(large_file)
+        
+        mock_upload_large.assert_called_once_with(
+            large_file, chunk_size=UPLOAD_CHUNK_SIZE, resource_type="auto"
+        )
+        mock_upload.assert_not_called()
+
+
 # Pytest fixtures and additional test utilities
 @pytest.fixture
 def api_client():
@@ -404,7 +834,7 @@ def api_client():
 
 
 @pytest.fixture
-def sample_uploaded_file():
+def sample_uploaded_file(db):
     """Pytest fixture for sample uploaded file"""
     return UploadedFile.objects.create(
         original_name="pytest_sample.txt",
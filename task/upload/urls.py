@@ -1,10 +1,19 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from django.urls import path
 from .views import UploadFileViewSet
 
-router = DefaultRouter()
-router.register(r'file-uploads', UploadFileViewSet)
+# Routes are declared directly rather than through a router + include(),
+# which saves a resolver level on every request
+file_list = UploadFileViewSet.as_view({'get': 'list', 'post': 'create'})
+file_detail = UploadFileViewSet.as_view({
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy',
+})
+file_bulk = UploadFileViewSet.as_view({'post': 'bulk'})
 
 urlpatterns = [
-    path('upload/', include(router.urls)),
-]
\ No newline at end of file
+    path('upload/file-uploads/', file_list, name='uploadedfile-list'),
+    path('upload/file-uploads/bulk/', file_bulk, name='uploadedfile-bulk'),
+    path('upload/file-uploads/<int:pk>/', file_detail, name='uploadedfile-detail'),
+]
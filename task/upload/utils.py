@@ -1,14 +1,46 @@
 # uploads/utils.py
+import os
+
+import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
+from urllib3.util.retry import Retry
+
+# Files above this size are streamed to Cloudinary in chunks
+LARGE_FILE_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 6_000_000
+
+# Keep-alive connections kept open to the Cloudinary API per process
+HTTP_POOL_MAXSIZE = 16
+
+# The SDK sends every API call through one module-level urllib3 pool manager,
+# but its default pool keeps a single connection per host, so concurrent
+# uploads (see the bulk endpoint) each reopen TLS. Swap in a larger pool,
+# built by the SDK's own factory so proxy and keep-alive settings still apply.
+# Retries cover connection failures; urllib3 does not replay POST bodies.
+cloudinary.uploader._http = cloudinary.utils.get_http_connector(
+    cloudinary.config(),
+    {
+        **cloudinary.CERT_KWARGS,
+        "maxsize": HTTP_POOL_MAXSIZE,
+        "retries": Retry(total=3, backoff_factor=0.3),
+    },
+)
+
 
 def upload_to_cloudinary(file):
     """
     Uploads a file to Cloudinary and returns a dictionary with the upload result, or a dictionary with an "error" key containing a string representation of the error that occurred.
 
+    Files larger than ``LARGE_FILE_THRESHOLD`` go through ``upload_large``, which
+    sends ``UPLOAD_CHUNK_SIZE`` parts so memory use stays bounded by the chunk size.
+    Both paths let Cloudinary detect the resource type, so a file is stored the
+    same way whatever its size.
+
     Parameters
     ----------
-    file : file-like object
-        The file to upload to Cloudinary.
+    file : str or file-like object
+        Path of, or file-like object for, the file to upload to Cloudinary.
 
     Returns
     -------
@@ -16,6 +48,40 @@ def upload_to_cloudinary(file):
         A dictionary with the Cloudinary upload result, or an error message if the upload fails.
     """
     try:
-        return cloudinary.uploader.upload(file)
+        size = os.path.getsize(file) if isinstance(file, str) else getattr(file, "size", 0)
+        if size > LARGE_FILE_THRESHOLD:
+            return cloudinary.uploader.upload_large(
+                file, chunk_size=UPLOAD_CHUNK_SIZE, resource_type="auto"
+            )
+        return cloudinary.uploader.upload(file, resource_type="auto")
     except Exception as e:
         return {"error": str(e)}
+
+
+def build_attachment_url(result):
+    """
+    Builds a URL that makes Cloudinary serve the uploaded file as a download.
+
+    Parameters
+    ----------
+    result : dict
+        A successful Cloudinary upload result.
+
+    Returns
+    -------
+    str
+        The ``fl_attachment`` delivery URL for the uploaded file.
+    """
+    public_id = result.get("public_id")
+    if not public_id:
+        return result["secure_url"].replace("/upload/", "/upload/fl_attachment/", 1)
+    url, _options = cloudinary.utils.cloudinary_url(
+        public_id,
+        resource_type=result.get("resource_type", "image"),
+        type=result.get("type", "upload"),
+        version=result.get("version"),
+        format=result.get("format"),
+        flags="attachment",
+        secure=True,
+    )
+    return url
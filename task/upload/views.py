@@ -1,88 +1,365 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, UnsupportedMediaType, ValidationError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.move import file_move_safe
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from drf_yasg import openapi
+from drf_yasg.utils import no_body, swagger_auto_schema
 from .models import UploadedFile
-from .serializers import FileUploadSerializer, UploadedFileSerializer
-from .utils import upload_to_cloudinary
+from .pagination import UploadedFilePagination
+from .serializers import BulkFileUploadSerializer, FileUploadSerializer, UploadedFileSerializer
+from .tasks import push_to_cloudinary
+from .utils import build_attachment_url, upload_to_cloudinary
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
+import tempfile
 
 logger = logging.getLogger(__name__)
 
+# Concurrent Cloudinary uploads per bulk request
+BULK_UPLOAD_WORKERS = 6
+
+# Room for multipart boundaries and part headers around the uploaded files
+MULTIPART_OVERHEAD = 64 * 1024
+
+# How long a response is replayed for a repeated Idempotency-Key, in seconds
+IDEMPOTENCY_KEY_TTL = 60 * 60
+# How long a key stays reserved by a request that is still uploading
+IDEMPOTENCY_RESERVATION_TTL = 5 * 60
+_IDEMPOTENCY_RESERVED = 'reserved'
+
+# Message and status code for each way an upload request can fail
+_ERROR_RESPONSES = {
+    'validation': ('Validation failed', status.HTTP_400_BAD_REQUEST),
+    'cloudinary_error': ('Cloudinary upload failed', status.HTTP_400_BAD_REQUEST),
+    'no_url': ('Upload failed - no URL received', status.HTTP_400_BAD_REQUEST),
+    'server': ('Upload failed', status.HTTP_500_INTERNAL_SERVER_ERROR),
+    'in_progress': ('Upload already in progress', status.HTTP_409_CONFLICT),
+}
+
+# Formats upload_date the same way UploadedFileSerializer does
+_UPLOAD_DATE_FIELD = serializers.DateTimeField()
+
+
+class RequestEntityTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Upload exceeds the maximum allowed size.'
+    default_code = 'request_entity_too_large'
+
+
+def _cloudinary_source(file):
+    """
+    Path of the upload when Django spooled it to disk, otherwise the file itself
+    """
+    if hasattr(file, 'temporary_file_path'):
+        return file.temporary_file_path()
+    return file
+
+
+def _list_etag(request, *args, **kwargs):
+    """
+    ETag for the file list: changes whenever a row is added, updated or deleted
+    """
+    stats = UploadedFile.objects.aggregate(count=Count('id'), last_updated=Max('updated_at'))
+    last_updated = stats['last_updated'].timestamp() if stats['last_updated'] else 0
+    return f"{request.accepted_renderer.format}-{stats['count']}-{last_updated}"
+
 
 class UploadFileViewSet(viewsets.ModelViewSet):
-    queryset = UploadedFile.objects.all()
+    queryset = UploadedFile.objects.with_size_units()
     serializer_class = UploadedFileSerializer
     parser_classes = [MultiPartParser, FormParser]  # Important for file uploads
+    pagination_class = UploadedFilePagination
+    
+    # Actions that take uploads; everything else reads UploadedFile rows
+    SERIALIZER_BY_ACTION = {
+        'create': FileUploadSerializer,
+        'bulk': BulkFileUploadSerializer,
+    }
+    
+    # Columns read by UploadedFileSerializer; list and retrieve load only these
+    _read_only_actions = ('list', 'retrieve')
+    _serialized_fields = (
+        'id',
+        'original_name',
+        'cloudinary_url',
+        'file_size',
+        'content_type',
+        'status',
+        'created_at',
+    )
+    
+    def initialize_request(self, request, *args, **kwargs):
+        # Spool every upload to a temporary file instead of memory, so
+        # Cloudinary can read it from disk without another copy
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+    
+    def initial(self, request, *args, **kwargs):
+        # Negotiate first so pre-flight errors honour Accept and ?format=
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        
+        # Reject uploads from their headers alone. This must come before
+        # authentication: SessionAuthentication's CSRF check reads
+        # request.POST, which parses and spools the whole body.
+        if self.action in ('create', 'bulk'):
+            if not request.content_type.startswith('multipart/'):
+                raise UnsupportedMediaType(request.content_type)
+            
+            if self.action == 'create':
+                max_size = settings.MAX_UPLOAD_SIZE
+            else:
+                max_size = settings.MAX_BULK_UPLOAD_SIZE
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                content_length = 0
+            if content_length > max_size + MULTIPART_OVERHEAD:
+                raise RequestEntityTooLarge()
+        
+        super().initial(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Saving a deferred instance writes only the loaded fields, which
+        # would leave updated_at (and the list ETag) stale on update
+        if self.action in self._read_only_actions:
+            queryset = queryset.only(*self._serialized_fields)
+        return queryset
     
     def get_serializer_class(self):
-        if self.action == 'create':
-            return FileUploadSerializer
-        return UploadedFileSerializer
+        return self.SERIALIZER_BY_ACTION.get(self.action, UploadedFileSerializer)
     
     def create(self, request, *args, **kwargs):
         """Handle file upload"""
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key:
+            return self._upload(request)
+        
+        # A retried request with the same key gets the original response
+        # back instead of uploading the file a second time. add() reserves
+        # the key atomically, so concurrent retries cannot both upload.
+        cache_key = f'upl:{idempotency_key}'
+        if not cache.add(cache_key, _IDEMPOTENCY_RESERVED, timeout=IDEMPOTENCY_RESERVATION_TTL):
+            cached = cache.get(cache_key)
+            if isinstance(cached, tuple):
+                status_code, body = cached
+                return Response(body, status=status_code)
+            return self._err('in_progress', {
+                'idempotency_key': 'A request with this key is still being processed'
+            })
+        
+        response = None
+        try:
+            response = self._upload(request)
+        finally:
+            # Keep accepted uploads; release the key after a failure so the
+            # client can retry
+            if response is not None and response.status_code in (
+                status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED
+            ):
+                cache.set(cache_key, (response.status_code, response.data), timeout=IDEMPOTENCY_KEY_TTL)
+            else:
+                cache.delete(cache_key)
+        return response
+    
+    def _upload(self, request):
+        """Validate the upload and send it to Cloudinary, or queue it"""
         serializer = self.get_serializer(data=request.data)
         
         if not serializer.is_valid():
-            return Response({
-                'success': False,
-                'message': 'Validation failed',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+            return self._err('validation', serializer.errors)
         
         file = serializer.validated_data['file']
+        # Read the file's metadata once; the upload may close or consume it
+        name, size, content_type = file.name, file.size, file.content_type
         
         try:
+            if settings.UPLOAD_ASYNC:
+                return self._create_async(file, name, size, content_type)
+            
             # Upload to Cloudinary
-            result = upload_to_cloudinary(file)
+            result = upload_to_cloudinary(_cloudinary_source(file))
             
             if result.get("error"):
-                return Response({
-                    'success': False,
-                    'message': 'Cloudinary upload failed',
-                    'errors': {'cloudinary': result.get('error')}
-                }, status=status.HTTP_400_BAD_REQUEST)
+                return self._err('cloudinary_error', {'cloudinary': result.get('error')})
             
             if "secure_url" not in result:
-                return Response({
-                    'success': False,
-                    'message': 'Upload failed - no URL received',
-                    'errors': {'cloudinary': 'No secure URL returned'}
-                }, status=status.HTTP_400_BAD_REQUEST)
+                return self._err('no_url', {'cloudinary': 'No secure URL returned'})
             
             # Create database record
-            uploaded_file = UploadedFile.objects.create(
-                original_name=file.name,
-                cloudinary_url=result["secure_url"],
-                file_size=file.size,
-                content_type=file.content_type,
-            )
+            uploaded_file, = self._persist([(name, size, content_type, result)])
             
-            # Return success response
-            response_serializer = UploadedFileSerializer(uploaded_file)
+            # Return success response; same shape as UploadedFileSerializer
             return Response({
                 'success': True,
                 'message': 'File uploaded successfully',
-                'data': response_serializer.data
+                'data': {
+                    'id': uploaded_file.pk,
+                    'original_name': name,
+                    'cloudinary_url': result['secure_url'],
+                    'file_size': size,
+                    'file_size_mb': uploaded_file.file_size_mb,
+                    'content_type': content_type,
+                    'status': uploaded_file.status,
+                    'upload_date': _UPLOAD_DATE_FIELD.to_representation(uploaded_file.created_at),
+                }
             }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            logger.error(f"Upload error: {str(e)}")
-            return Response({
-                'success': False,
-                'message': 'Upload failed',
-                'errors': {'server': str(e)}
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            logger.error("Upload error: %s", e)
+            return self._err('server', {'server': str(e)})
     
+    def _err(self, key, errors):
+        """Failure response for one of the _ERROR_RESPONSES cases"""
+        message, status_code = _ERROR_RESPONSES[key]
+        return Response({
+            'success': False,
+            'message': message,
+            'errors': errors
+        }, status=status_code)
+    
+    def _persist(self, uploads):
+        """
+        Save (name, size, content_type, cloudinary_result) uploads in one
+        transaction, batching the INSERTs
+        """
+        uploaded_files = [
+            UploadedFile(
+                original_name=name,
+                cloudinary_url=result["secure_url"],
+                public_id=result.get("public_id", ""),
+                attachment_url=build_attachment_url(result),
+                file_size=size,
+                content_type=content_type,
+            )
+            for name, size, content_type, result in uploads
+        ]
+        with transaction.atomic():
+            return UploadedFile.objects.bulk_create(uploaded_files, batch_size=500)
+    
+    def _create_async(self, file, name, size, content_type):
+        """Let a Celery worker send the spooled upload to Cloudinary"""
+        # Take over the temporary file Django spooled the upload to, so it
+        # outlives the request without being copied again
+        fd, temp_path = tempfile.mkstemp(
+            suffix=os.path.splitext(name)[1],
+            dir=os.path.dirname(file.temporary_file_path()),
+        )
+        os.close(fd)
+        try:
+            file_move_safe(file.temporary_file_path(), temp_path, allow_overwrite=True)
+            uploaded_file = UploadedFile.objects.create(
+                original_name=name,
+                file_size=size,
+                content_type=content_type,
+                status=UploadedFile.Status.PENDING,
+            )
+        except Exception:
+            # Django no longer owns the file, so nothing else will remove it
+            os.unlink(temp_path)
+            raise
+        
+        def enqueue():
+            try:
+                push_to_cloudinary.delay(uploaded_file.pk, temp_path)
+            except Exception:
+                # No worker will ever pick the upload up
+                uploaded_file.delete()
+                os.unlink(temp_path)
+                raise
+        
+        # Only enqueue once the row is visible to the worker
+        transaction.on_commit(enqueue)
+        
+        response_serializer = UploadedFileSerializer(uploaded_file)
+        return Response({
+            'success': True,
+            'message': 'File accepted for upload',
+            'data': response_serializer.data
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    # Swagger 2 cannot describe a list of files as a body schema, so
+    # document the repeated multipart field instead
+    @swagger_auto_schema(
+        request_body=no_body,
+        manual_parameters=[openapi.Parameter(
+            'files', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+            description="File to upload; repeat the field for each file"
+        )]
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Upload several files, sending them to Cloudinary concurrently"""
+        serializer = self.get_serializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return self._err('validation', serializer.errors)
+        
+        files = serializer.validated_data['files']
+        
+        try:
+            with ThreadPoolExecutor(max_workers=BULK_UPLOAD_WORKERS) as executor:
+                results = list(executor.map(
+                    upload_to_cloudinary, [_cloudinary_source(file) for file in files]
+                ))
+            
+            uploads = []
+            # A list, not a dict by name: several files may share a name
+            failures = []
+            for file, result in zip(files, results):
+                if result.get("error") or "secure_url" not in result:
+                    failures.append({
+                        'name': file.name,
+                        'error': result.get("error", 'No secure URL returned'),
+                    })
+                    continue
+                uploads.append((file.name, file.size, file.content_type, result))
+            
+            if not uploads:
+                return self._err('cloudinary_error', {'cloudinary': failures})
+            
+            uploaded_files = self._persist(uploads)
+            
+            response_data = {
+                'success': True,
+                'message': f'{len(uploaded_files)} file(s) uploaded successfully',
+                'data': UploadedFileSerializer(uploaded_files, many=True).data
+            }
+            if failures:
+                response_data['errors'] = {'cloudinary': failures}
+            return Response(response_data, status=status.HTTP_201_CREATED)
+            
+        except Exception as e:
+            logger.error("Bulk upload error: %s", e)
+            return self._err('server', {'server': str(e)})
+    
+    @method_decorator(condition(etag_func=_list_etag))
     def list(self, request, *args, **kwargs):
-        """List all uploaded files"""
+        """List uploaded files, one page at a time"""
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        # Without pagination, stream rows instead of caching the whole result
+        serializer = self.get_serializer(queryset.iterator(chunk_size=500), many=True)
         return Response({
             'success': True,
-            'count': len(serializer.data),
+            'count': queryset.count(),
             'data': serializer.data
         })
     